@@ -1,114 +1,212 @@
 import argparse
 import json
 import os
+import pathlib
+import sqlite3
 import datetime
-import uuid
 
 """
 Example usage:
 python spending-tracker.py add "Coffee" 3.50
 """
 
-STORAGE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spendings.json")
+STORAGE_DIR = pathlib.Path(__file__).absolute().parent
+STORAGE_FILE = STORAGE_DIR / "spendings.db"
+# Previous JSON storage, imported once when the database schema is created
+JSON_STORAGE_FILE = STORAGE_DIR / "spendings.json"
+
+# Stored in PRAGMA user_version once the schema exists and the JSON import succeeded
+SCHEMA_VERSION = 1
+# Separate statements rather than one script: executescript() commits on its own,
+# which would split the migration transaction
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS spendings (
+        id TEXT PRIMARY KEY,
+        item TEXT NOT NULL,
+        amount REAL NOT NULL,
+        currency TEXT NOT NULL,
+        category TEXT NOT NULL,
+        date TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_spendings_date ON spendings(date)",
+    "CREATE INDEX IF NOT EXISTS idx_spendings_category ON spendings(category)",
+)
+
+def _new_id():
+    """Return a random 64-bit ID as 16 hex digits.
+
+    Cheaper than str(uuid.uuid4()). Hex is used rather than base64, whose
+    IDs could start with '-' and be parsed as an option by argparse.
+    """
+    return os.urandom(8).hex()
+
+def _format_date(date):
+    # ISO-8601 text sorts chronologically, so SQLite can range-filter it directly
+    return date.isoformat(timespec="seconds")
+
+def _parse_cli_date(value):
+    """Parse a YYYY-MM-DD command-line argument into a naive datetime at midnight."""
+    return datetime.datetime.combine(datetime.date.fromisoformat(value), datetime.time.min)
+
+def _read_json_storage():
+    """Yield the records of the old spendings.json (JSON Lines or a single JSON array)."""
+    try:
+        with open(JSON_STORAGE_FILE, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return
+    if content.lstrip().startswith(b"["):
+        yield from json.loads(content)
+    else:
+        for line in content.splitlines():
+            if line.strip():
+                yield json.loads(line)
 
 class Spending:
+    """A spending record on its way into the database.
+
+    Built by append_many for new entries and by from_dict when importing the
+    old spendings.json; reads go straight from SQL rows instead.
+    """
+
+    __slots__ = ("id", "item", "amount", "currency", "category", "date")
+
     def __init__(self, item, amount, currency="usd", category="Other", id=None, date=None):
-        self.id = id or str(uuid.uuid4())
+        self.id = id or _new_id()
         self.item = item
         self.amount = amount
         self.currency = currency
         self.category = category
-        self.date = date or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "item": self.item,
-            "amount": self.amount,
-            "currency": self.currency,
-            "category": self.category,
-            "date": self.date
-        }
+        self.date = date or datetime.datetime.now().replace(microsecond=0)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Spending from a stored record, skipping the defaults logic of __init__."""
+        spending = cls.__new__(cls)
+        spending.id = data["id"]
+        spending.item = data["item"]
+        spending.amount = data["amount"]
+        spending.currency = data["currency"]
+        spending.category = data["category"]
+        # Also reads the older "YYYY-MM-DD HH:MM:SS" form
+        spending.date = datetime.datetime.fromisoformat(data["date"])
+        return spending
+
+    def to_row(self):
+        """Return the values for an INSERT into the spendings table."""
+        return (self.id, self.item, self.amount, self.currency, self.category, _format_date(self.date))
 
 class SpendingTracker:
     def __init__(self):
-        self.spendings: list[Spending] = []
-
-    def load_spendings(self):
-        """Load spendings from the storage file."""
-        if os.path.exists(STORAGE_FILE):
-            with open(STORAGE_FILE, 'r') as f:
-                data = json.load(f)
-                self.spendings = [Spending(**item) for item in data]
-        else:
-            self.spendings = []
-    
-    def save_spendings(self):
-        """Save spendings to the storage file."""
-        with open(STORAGE_FILE, 'w') as f:
-            json.dump([spending.to_dict() for spending in self.spendings], f, indent=4)
+        self.connection: sqlite3.Connection | None = None
+
+    def connect(self):
+        """Open the storage database, creating the schema on first use."""
+        self.connection = sqlite3.connect(STORAGE_FILE)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        if self._schema_version() < SCHEMA_VERSION:
+            self._migrate()
+
+    def _schema_version(self):
+        return self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def _migrate(self):
+        """Create the schema and import the old spendings.json in one transaction.
+
+        If the import fails, nothing is committed and it is retried on the next connect.
+        """
+        with self.connection:
+            # IMMEDIATE so a concurrent run waits here instead of migrating twice
+            self.connection.execute("BEGIN IMMEDIATE")
+            if self._schema_version() >= SCHEMA_VERSION:
+                return
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            # Databases created before the version was tracked already hold the
+            # imported entries; importing again would bring back deleted ones
+            if not self.has_spendings():
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO spendings VALUES (?, ?, ?, ?, ?, ?)",
+                    (Spending.from_dict(data).to_row() for data in _read_json_storage()))
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def has_spendings(self):
+        """Check whether any spending has been recorded."""
+        return self.connection.execute("SELECT EXISTS (SELECT 1 FROM spendings)").fetchone()[0] == 1
 
     def append_spending(self, item, amount, currency="usd", category="Other", date=None):
         """Append a new spending item."""
-        spending = Spending(item, amount, currency=currency, category=category, date=date)
-        self.spendings.append(spending)
-        self.save_spendings()
+        self.append_many([(item, amount, currency, category, date)])
+
+    def append_many(self, rows):
+        """Append several spending items in a single transaction.
+
+        Each row is a tuple of append_spending arguments: (item, amount[, currency[, category[, date]]]).
+        """
+        now = datetime.datetime.now().replace(microsecond=0)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO spendings VALUES (?, ?, ?, ?, ?, ?)",
+                (self._new_spending(now, *row).to_row() for row in rows))
+
+    @staticmethod
+    def _new_spending(now, item, amount, currency="usd", category="Other", date=None):
+        return Spending(item, amount, currency=currency, category=category, date=date or now)
 
     def get_total_spendings(self):
-        """Calculate the total amount of spendings."""
-        total_spendings = dict()
-        for spending in self.spendings:
-            if spending.currency not in total_spendings:
-                total_spendings[spending.currency] = 0
-            total_spendings[spending.currency] += spending.amount
-        return total_spendings
+        """Calculate the total amount of spendings per currency."""
+        # Currencies are listed in the order they were first used
+        return dict(self.connection.execute(
+            "SELECT currency, SUM(amount) FROM spendings GROUP BY currency ORDER BY MIN(rowid)"))
 
     def overview(self, from_date=None, to_date=None, category=None):
-        overview = f"\nCurrent spendings:\n"
-        for spending in self.spendings:
-            spending.date = datetime.datetime.strptime(spending.date, "%Y-%m-%d %H:%M:%S")
-            if category and spending.category != category:
-                continue
-            if from_date and spending.date < from_date:
-                continue
-            if to_date and spending.date > to_date:
-                continue
-            overview += f"{spending.item}: {spending.amount:.2f} {spending.currency} ({spending.category}, on {spending.date})\n"
+        conditions = []
+        params = []
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if from_date:
+            conditions.append("date >= ?")
+            params.append(_format_date(from_date))
+        if to_date:
+            conditions.append("date <= ?")
+            params.append(_format_date(to_date))
+        # Dates are shown with a space instead of the stored 'T', without parsing them
+        query = "SELECT item, amount, currency, category, replace(date, 'T', ' ') FROM spendings"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid"
+
+        parts = ["\nCurrent spendings:\n"]
+        for item, amount, currency, category_, date in self.connection.execute(query, params):
+            parts.append(f"{item}: {amount:.2f} {currency} ({category_}, on {date})\n")
         total = self.get_total_spendings()
-        overview += "\nTotal spendings: "
-        for currency, amount in total.items():
-            overview += f"{amount:.2f} {currency}, "
-        overview = overview[:-2] + "\n"
-        return overview
+        parts.append("\nTotal spendings: ")
+        parts.append(", ".join(f"{amount:.2f} {currency}" for currency, amount in total.items()))
+        parts.append("\n")
+        return "".join(parts)
 
     def delete_spending(self, spending_id):
         """Delete a spending item by its ID."""
-        for spending in self.spendings:
-            if spending.id == spending_id:
-                self.spendings.remove(spending)
-                break
-        else:
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM spendings WHERE id = ?", (spending_id,))
+        if cursor.rowcount == 0:
             print(f"No spending found with ID {spending_id}.")
             return
-        self.save_spendings()
         print(f"Spending with ID {spending_id} has been deleted.")
 
     def edit_spending(self, spending_id, item=None, amount=None, currency=None, category=None):
         """Edit a spending item by its ID."""
-        for spending in self.spendings:
-            if spending.id == spending_id:
-                if item is not None:
-                    spending.item = item
-                if amount is not None:
-                    spending.amount = amount
-                if currency is not None:
-                    spending.currency = currency
-                if category is not None:
-                    spending.category = category
-                self.save_spendings()
-                print(f"Spending with ID {spending_id} has been updated.")
-                return
-        print(f"No spending found with ID {spending_id}.")
+        with self.connection:
+            # COALESCE keeps the current value of every field passed as None
+            cursor = self.connection.execute(
+                "UPDATE spendings SET item = COALESCE(?, item), amount = COALESCE(?, amount), "
+                "currency = COALESCE(?, currency), category = COALESCE(?, category) WHERE id = ?",
+                (item, amount, currency, category, spending_id))
+        if cursor.rowcount == 0:
+            print(f"No spending found with ID {spending_id}.")
+            return
+        print(f"Spending with ID {spending_id} has been updated.")
 
 def parser():
     parser_ = argparse.ArgumentParser(description="A simple command-line tool for tracking spendings.")
@@ -149,35 +247,35 @@ if __name__ == "__main__":
     args = parser_.parse_args()
 
     tracker = SpendingTracker()
-    tracker.load_spendings()
+    tracker.connect()
 
     if args.command == "add":
         # Convert date to datetime object if provided
         date = None
         if args.date:
             try:
-                date = datetime.datetime.strptime(args.date, "%Y-%m-%d").strftime("%Y-%m-%d %H:%M:%S")
+                date = _parse_cli_date(args.date)
             except ValueError:
                 print("Invalid date format. Please use YYYY-MM-DD.")
                 exit(1)
         tracker.append_spending(args.item, args.amount, currency=args.currency, category=args.category, date=date)
 
     elif args.command == "list":
-        if tracker.spendings:
-            from_date = datetime.datetime.strptime(args.date_from, "%Y-%m-%d") if args.date_from else None
-            to_date = datetime.datetime.strptime(args.date_to, "%Y-%m-%d") if args.date_to else None
+        if tracker.has_spendings():
+            from_date = _parse_cli_date(args.date_from) if args.date_from else None
+            to_date = _parse_cli_date(args.date_to) if args.date_to else None
             print(tracker.overview(from_date=from_date, to_date=to_date, category=args.category))
         else:
             print("No spendings recorded yet.")
 
     elif args.command == "delete":
-        if tracker.spendings:
+        if tracker.has_spendings():
             tracker.delete_spending(args.id)
         else:
             print("No spendings recorded yet.")
 
     elif args.command == "edit":
-        if tracker.spendings:
+        if tracker.has_spendings():
             tracker.edit_spending(args.id, item=args.item, amount=args.amount, currency=args.currency, category=args.category)
         else:
             print("No spendings recorded yet.")
@@ -0,0 +1,66 @@
+import importlib.util
+import json
+import pathlib
+import tempfile
+import unittest
+
+SCRIPT = pathlib.Path(__file__).resolve().parent.parent / "cli" / "spending-tracker.py"
+
+spec = importlib.util.spec_from_file_location("spending_tracker", SCRIPT)
+spending_tracker = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(spending_tracker)
+
+RECORDS = [
+    {"id": "a", "item": "Tea", "amount": 2.0, "currency": "eur", "category": "Food", "date": "2024-01-10 10:00:00"},
+    {"id": "b", "item": "Coffee", "amount": 3.5, "currency": "usd", "category": "Other", "date": "2024-01-11T09:30:00"},
+]
+
+
+class JsonImportTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        directory = pathlib.Path(tmp_dir.name)
+        self.json_file = directory / "spendings.json"
+        for name, path in (("STORAGE_FILE", directory / "spendings.db"), ("JSON_STORAGE_FILE", self.json_file)):
+            self.addCleanup(setattr, spending_tracker, name, getattr(spending_tracker, name))
+            setattr(spending_tracker, name, path)
+
+    def connect(self):
+        tracker = spending_tracker.SpendingTracker()
+        tracker.connect()
+        self.addCleanup(tracker.connection.close)
+        return tracker
+
+    def assert_imported(self, tracker):
+        self.assertEqual(tracker.get_total_spendings(), {"eur": 2.0, "usd": 3.5})
+        self.assertIn("Tea: 2.00 eur (Food, on 2024-01-10 10:00:00)", tracker.overview())
+        self.assertIn("Coffee: 3.50 usd (Other, on 2024-01-11 09:30:00)", tracker.overview())
+
+    def test_imports_legacy_array(self):
+        self.json_file.write_text(json.dumps(RECORDS, indent=4))
+        self.assert_imported(self.connect())
+
+    def test_imports_json_lines(self):
+        self.json_file.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+        self.assert_imported(self.connect())
+
+    def test_failed_import_is_retried(self):
+        self.json_file.write_text(json.dumps(RECORDS[0]) + "\n{bad\n")
+        with self.assertRaises(json.JSONDecodeError):
+            self.connect()
+
+        self.json_file.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+        self.assert_imported(self.connect())
+
+    def test_import_runs_only_once(self):
+        self.json_file.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+        tracker = self.connect()
+        tracker.delete_spending("a")
+        tracker.connection.close()
+
+        self.assertEqual(self.connect().get_total_spendings(), {"usd": 3.5})
+
+
+if __name__ == "__main__":
+    unittest.main()